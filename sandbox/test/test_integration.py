@@ -167,7 +167,7 @@ def running_kernel(workspace):
     )
 
     runtime_dir = kernel_json_path.parent.parent
-    conn = json.loads(kernel_json_path.read_text())
+    conn = json.loads(kernel_json_path.read_bytes())
     host_sockets_dir = kernel_json_path.parent
 
     # kernel.json is written by the launcher shell *before* Julia starts.
@@ -225,7 +225,7 @@ def raw_running_kernel(workspace):
     )
 
     runtime_dir = kernel_json_path.parent.parent
-    conn = json.loads(kernel_json_path.read_text())
+    conn = json.loads(kernel_json_path.read_bytes())
     host_sockets_dir = kernel_json_path.parent
 
     _wait_for_kernel_sockets(host_sockets_dir, conn, proc)
@@ -253,7 +253,7 @@ def execute_and_collect(km, code, timeout=30):
 
 def collect_iopub_for_msg(km, msg_id, timeout=30):
     """Collect iopub output for an existing execute_request."""
-    result_text = ""
+    result_parts = []
     error_text = ""
 
     deadline = time.time() + timeout
@@ -268,15 +268,75 @@ def collect_iopub_for_msg(km, msg_id, timeout=30):
 
         mt = msg["msg_type"]
         if mt in ("execute_result", "display_data"):
-            result_text += msg["content"]["data"].get("text/plain", "")
+            result_parts.append(msg["content"]["data"].get("text/plain", ""))
         elif mt == "stream":
-            result_text += msg["content"]["text"]
+            result_parts.append(msg["content"]["text"])
         elif mt == "error":
             error_text = "\n".join(msg["content"]["traceback"])
         elif mt == "status" and msg["content"]["execution_state"] == "idle":
             break
 
-    return result_text, error_text
+    return "".join(result_parts), error_text
+
+
+def wait_for_stream_text(km, msg_id, text, timeout=30):
+    """Block until msg_id's stdout stream contains text."""
+    seen = []
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            msg = km.get_iopub_msg(timeout=1)
+        except Exception:
+            continue
+        if (
+            msg.get("parent_header", {}).get("msg_id") == msg_id
+            and msg["msg_type"] == "stream"
+        ):
+            seen.append(msg["content"]["text"])
+            if text in "".join(seen):
+                return
+    pytest.fail(f"{text!r} not printed by {msg_id} within {timeout} seconds")
+
+
+def interrupt_blocking_execution(running_kernel, code):
+    """Start code, send SIGUSR1 to the launcher once it is running, and drain
+    iopub until the interrupted execution goes idle.
+
+    Returns whether the execution reported an error, i.e. whether the
+    interrupt was actually delivered to it.
+    """
+    km = running_kernel.client
+
+    # IJulia reports busy before user code runs, so have the cell announce
+    # itself right before the blocking call and only signal after that.
+    marker = "7aigent-interrupt-ready"
+    msg_id = km.execute(f'println("{marker}"); flush(stdout); {code}')
+    wait_for_stream_text(km, msg_id, marker)
+    os.kill(running_kernel.process.pid, signal.SIGUSR1)
+
+    # Drain iopub: wait until we see either an error traceback (interrupt
+    # delivered) or idle status.  Under gvisor-systrap the signal path
+    # can be slow, so we keep draining for a generous window.
+    deadline = time.time() + 30
+    saw_interrupt = False
+    while time.time() < deadline:
+        try:
+            msg = km.get_iopub_msg(timeout=2.0)
+        except Exception:
+            if saw_interrupt:
+                break
+            continue
+
+        if msg.get("parent_header", {}).get("msg_id") != msg_id:
+            continue
+
+        mt = msg["msg_type"]
+        if mt == "error":
+            saw_interrupt = True
+        elif mt == "status" and msg["content"]["execution_state"] == "idle":
+            break
+
+    return saw_interrupt
 
 
 # ── S8, S11, S13: basic connectivity and policy ─────────────────────────────
@@ -402,31 +462,10 @@ class TestInterrupt:
         loop (Julia's safepoint mechanism requires native ptrace support).
         The agent's A16 VM test already validates this path with `sleep`.
         """
-        km = running_kernel.client
+        saw_interrupt = interrupt_blocking_execution(running_kernel, "sleep(300)")
+        assert saw_interrupt, "sleep(300) finished without reporting an interrupt"
 
-        km.execute("sleep(300)")
-        time.sleep(2.0)
-        os.kill(running_kernel.process.pid, signal.SIGUSR1)
-
-        # Drain iopub: wait until we see either an error traceback (interrupt
-        # delivered) or idle status.  Under gvisor-systrap the signal path
-        # can be slow, so we keep draining for a generous window.
-        deadline = time.time() + 30
-        saw_interrupt = False
-        while time.time() < deadline:
-            try:
-                msg = km.get_iopub_msg(timeout=2.0)
-                mt = msg.get("msg_type", "")
-                if mt == "error":
-                    saw_interrupt = True
-                if mt == "status" and msg["content"]["execution_state"] == "idle":
-                    break
-            except Exception:
-                if saw_interrupt:
-                    break
-                continue
-
-        result, err = execute_and_collect(km, "1 + 1", timeout=30)
+        result, err = execute_and_collect(running_kernel.client, "1 + 1", timeout=30)
         assert "2" in result, (
             f"Kernel did not recover after interrupt. result={result!r} err={err!r}"
         )
@@ -436,28 +475,10 @@ class TestInterrupt:
         S20: SIGUSR1 to the launcher must also kill a child process spawned
         with run(). After the interrupt the kernel must recover (S19).
         """
-        km = running_kernel.client
-
-        km.execute("run(`sleep 300`)")
-        time.sleep(2.0)
-        os.kill(running_kernel.process.pid, signal.SIGUSR1)
-
-        deadline = time.time() + 30
-        saw_interrupt = False
-        while time.time() < deadline:
-            try:
-                msg = km.get_iopub_msg(timeout=2.0)
-                mt = msg.get("msg_type", "")
-                if mt == "error":
-                    saw_interrupt = True
-                if mt == "status" and msg["content"]["execution_state"] == "idle":
-                    break
-            except Exception:
-                if saw_interrupt:
-                    break
-                continue
+        saw_interrupt = interrupt_blocking_execution(running_kernel, "run(`sleep 300`)")
+        assert saw_interrupt, "run(`sleep 300`) finished without reporting an interrupt"
 
-        result, err = execute_and_collect(km, "2 + 2", timeout=30)
+        result, err = execute_and_collect(running_kernel.client, "2 + 2", timeout=30)
         assert "4" in result, (
             f"Kernel did not recover after interrupting child process. "
             f"result={result!r} err={err!r}"
@@ -683,28 +704,7 @@ class TestSummaryRPC:
         km.input(f"ok\n{node_id}\t{summary_b64}")
 
         # Collect execution result (summarize! should complete now).
-        exec_result = ""
-        exec_err = ""
-        deadline = time.time() + 60
-        while time.time() < deadline:
-            try:
-                msg = km.get_iopub_msg(timeout=1)
-            except Exception:
-                continue
-            if msg.get("parent_header", {}).get("msg_id") != msg_id:
-                continue
-            mt = msg["msg_type"]
-            if mt in ("execute_result", "display_data"):
-                exec_result += msg["content"]["data"].get("text/plain", "")
-            elif mt == "stream":
-                exec_result += msg["content"]["text"]
-            elif mt == "error":
-                exec_err = "\n".join(msg["content"]["traceback"])
-            elif (
-                mt == "status"
-                and msg["content"]["execution_state"] == "idle"
-            ):
-                break
+        _, exec_err = collect_iopub_for_msg(km, msg_id, timeout=60)
 
         assert exec_err == "", f"summarize! failed over comm: {exec_err}"
 
@@ -41,6 +41,7 @@ REPO_ROOT = Path(__file__).parent.parent.parent
 BUILT_LAUNCHER = Path(os.environ["SANDBOX_LAUNCHER"]) if "SANDBOX_LAUNCHER" in os.environ \
     else REPO_ROOT / "result" / "bin" / "7aigent-sandbox"
 SANDBOX_GIT_ROOT = "/git-metadata"
+GIT_HEAD = "ref: refs/heads/main\n"
 UUID4_RE = re.compile(
     r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$",
     re.IGNORECASE,
@@ -65,18 +66,22 @@ def get_launcher() -> Path:
     )
 
 
-def run_dry_run(workspace: Path, extra_env: dict | None = None) -> DryRunOutput:
-    launcher = get_launcher()
-    env = {**os.environ, "SANDBOX_DRY_RUN": "1"}
-    if extra_env:
-        env.update(extra_env)
+def dry_run_env(**overrides: str) -> dict:
+    """Return the host environment with SANDBOX_DRY_RUN=1 and overrides merged in."""
+    return {**os.environ, "SANDBOX_DRY_RUN": "1", **overrides}
+
 
-    result = subprocess.run(
-        [str(launcher), str(workspace)],
+def _invoke_launcher(workspace: Path, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [str(get_launcher()), str(workspace)],
         capture_output=True,
         text=True,
-        env=env,
+        env=dry_run_env(**env),
     )
+
+
+def run_dry_run(workspace: Path, extra_env: dict | None = None) -> DryRunOutput:
+    result = _invoke_launcher(workspace, **(extra_env or {}))
     assert result.returncode == 0, f"Launcher failed:\n{result.stderr}"
 
     kernel_json_path = Path(result.stdout.strip())
@@ -86,19 +91,56 @@ def run_dry_run(workspace: Path, extra_env: dict | None = None) -> DryRunOutput:
     config_json_path = runtime_dir / "bundle" / "config.json"
     assert config_json_path.exists(), f"config.json not found at {config_json_path}"
 
-    with kernel_json_path.open() as f:
-        kernel_json = json.load(f)
-    with config_json_path.open() as f:
-        config_json = json.load(f)
-
     return DryRunOutput(
         result=result,
         kernel_json_path=kernel_json_path,
         runtime_dir=runtime_dir,
-        kernel_json=kernel_json,
-        config_json=config_json,
+        kernel_json=json.loads(kernel_json_path.read_bytes()),
+        config_json=json.loads(config_json_path.read_bytes()),
+    )
+
+
+def run_failing_dry_run(workspace: Path, **env: str) -> subprocess.CompletedProcess:
+    """Run a dry run that the launcher is expected to reject."""
+    result = _invoke_launcher(workspace, **env)
+    assert result.returncode != 0
+    return result
+
+
+def run_bwrap_until_sigint(workspace: Path) -> Path:
+    """Start the resident bwrap launcher, send it SIGINT, and wait for exit.
+
+    Returns the runtime directory the launcher reported so callers can check
+    that it was cleaned up. Skips if bwrap cannot start in this environment.
+    """
+    proc = subprocess.Popen(
+        [str(get_launcher()), str(workspace)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "SANDBOX_RUNNER": "bwrap"},
     )
 
+    kernel_json_path = Path(proc.stdout.readline().strip())
+    if not kernel_json_path.exists():
+        stderr = proc.stderr.read().strip()
+        pytest.skip(
+            "bwrap launcher could not start in this environment: "
+            f"{stderr or 'no kernel.json produced'}"
+        )
+
+    time.sleep(1.0)
+    proc.send_signal(signal.SIGINT)
+
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait(timeout=10)
+        pytest.fail("launcher did not exit after SIGINT")
+
+    return kernel_json_path.parent.parent
+
 
 def ensure_state_dir(workspace: Path) -> Path:
     state_dir = workspace / ".7aigent" / "state"
@@ -115,14 +157,25 @@ def runtime_store_paths() -> list[str]:
     ]
 
 
+def init_workspace(path: Path) -> Path:
+    """Populate path as a minimal workspace with a .git subdirectory."""
+    ensure_state_dir(path)
+    git_dir = path / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text(GIT_HEAD)
+    return path
+
+
 @pytest.fixture
 def workspace(tmp_path):
     """A minimal workspace directory with a .git subdirectory."""
-    ensure_state_dir(tmp_path)
-    git_dir = tmp_path / ".git"
-    git_dir.mkdir()
-    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
-    return tmp_path
+    return init_workspace(tmp_path)
+
+
+@pytest.fixture(scope="module")
+def shared_workspace(tmp_path_factory):
+    """A minimal workspace shared by tests that only inspect one dry run."""
+    return init_workspace(tmp_path_factory.mktemp("workspace"))
 
 
 @pytest.fixture
@@ -134,23 +187,20 @@ def gitfile_workspace(tmp_path):
 
     repo = tmp_path / "repo"
     subprocess.run([git, "init", str(repo)], check=True, capture_output=True, text=True)
+    (repo / "tracked.txt").write_text("hello\n")
+    subprocess.run([git, "add", "tracked.txt"], cwd=repo, check=True, capture_output=True, text=True)
     subprocess.run(
-        [git, "config", "user.email", "sandbox@example.com"],
-        cwd=repo,
-        check=True,
-        capture_output=True,
-        text=True,
-    )
-    subprocess.run(
-        [git, "config", "user.name", "Sandbox Test"],
+        [
+            git,
+            "-c", "user.email=sandbox@example.com",
+            "-c", "user.name=Sandbox Test",
+            "commit", "-m", "init",
+        ],
         cwd=repo,
         check=True,
         capture_output=True,
         text=True,
     )
-    (repo / "tracked.txt").write_text("hello\n")
-    subprocess.run([git, "add", "tracked.txt"], cwd=repo, check=True, capture_output=True, text=True)
-    subprocess.run([git, "commit", "-m", "init"], cwd=repo, check=True, capture_output=True, text=True)
 
     workspace = tmp_path / "worktree"
     subprocess.run(
@@ -179,7 +229,7 @@ def git_symlink_workspace(tmp_path):
     """A workspace whose .git is a symlink to an external git directory."""
     external_git_dir = tmp_path / "external-git"
     external_git_dir.mkdir()
-    (external_git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (external_git_dir / "HEAD").write_text(GIT_HEAD)
 
     workspace = tmp_path / "workspace"
     workspace.mkdir()
@@ -195,9 +245,10 @@ def no_git_workspace(tmp_path):
     return tmp_path
 
 
-@pytest.fixture
-def dry_run_output(workspace):
-    return run_dry_run(workspace)
+@pytest.fixture(scope="module")
+def dry_run_output(shared_workspace):
+    """One dry run per module; tests must treat its output as read-only."""
+    return run_dry_run(shared_workspace)
 
 
 # ── S9: connection file shape ────────────────────────────────────────────────
@@ -222,17 +273,14 @@ class TestConnectionFile:
             f"key {dry_run_output.kernel_json['key']!r} is not a UUID4"
         )
 
-    def test_all_five_ports_present(self, dry_run_output):
+    @pytest.mark.parametrize(
+        "port_field",
+        ["shell_port", "iopub_port", "stdin_port", "control_port", "hb_port"],
+    )
+    def test_all_five_ports_present(self, dry_run_output, port_field):
         """S8: all five Jupyter channel ports must be present."""
-        for port_field in (
-            "shell_port",
-            "iopub_port",
-            "stdin_port",
-            "control_port",
-            "hb_port",
-        ):
-            assert port_field in dry_run_output.kernel_json
-            assert isinstance(dry_run_output.kernel_json[port_field], int)
+        assert port_field in dry_run_output.kernel_json
+        assert isinstance(dry_run_output.kernel_json[port_field], int)
 
     def test_key_is_fresh_each_run(self, workspace):
         """S9: each launcher invocation generates a distinct HMAC key."""
@@ -274,16 +322,16 @@ class TestOCIConfig:
         sandbox_out = str(get_launcher().resolve().parent.parent)
         assert sandbox_out in runtime_store_paths()
 
-    def test_workspace_is_readwrite(self, dry_run_output, workspace):
+    def test_workspace_is_readwrite(self, dry_run_output, shared_workspace):
         """S10: /workspace must be a bind mount of the workspace path."""
         mount = _find_mount(dry_run_output.config_json["mounts"], "/workspace")
         assert mount is not None, "/workspace mount missing"
-        assert mount["source"] == str(workspace.resolve())
+        assert mount["source"] == str(shared_workspace.resolve())
         assert "ro" not in mount["options"], "/workspace must be rw, not ro"
 
-    def test_state_dir_is_readonly(self, dry_run_output, workspace):
+    def test_state_dir_is_readonly(self, dry_run_output, shared_workspace):
         """S10a: /workspace/.7aigent/state must be a read-only bind mount."""
-        state_dir = (workspace / ".7aigent" / "state").resolve()
+        state_dir = (shared_workspace / ".7aigent" / "state").resolve()
         mount = _find_mount(dry_run_output.config_json["mounts"], "/workspace/.7aigent/state")
         assert mount is not None, "/workspace/.7aigent/state mount missing"
         assert mount["source"] == str(state_dir)
@@ -297,11 +345,11 @@ class TestOCIConfig:
         assert ws_idx != -1 and state_idx != -1
         assert state_idx > ws_idx
 
-    def test_git_directory_is_readonly(self, dry_run_output, workspace):
+    def test_git_directory_is_readonly(self, dry_run_output, shared_workspace):
         """S11b: .git directories are over-mounted read-only."""
         mount = _find_mount(dry_run_output.config_json["mounts"], "/workspace/.git")
         assert mount is not None, "/workspace/.git mount missing"
-        assert mount["source"] == str((workspace / ".git").resolve())
+        assert mount["source"] == str((shared_workspace / ".git").resolve())
         assert "ro" in mount["options"], "/workspace/.git must be read-only"
 
     def test_git_mount_after_workspace_mount(self, dry_run_output):
@@ -385,29 +433,23 @@ class TestLauncherHardening:
         run_dry_run(no_git_workspace)
         git_dir = no_git_workspace / ".git"
         git_dir.mkdir()
-        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (git_dir / "HEAD").write_text(GIT_HEAD)
 
-        result = subprocess.run(
-            [str(get_launcher()), str(no_git_workspace)],
-            capture_output=True,
-            text=True,
-            env={**os.environ, "SANDBOX_DRY_RUN": "1"},
-        )
-        assert result.returncode != 0
+        result = run_failing_dry_run(no_git_workspace)
         assert "nogit" in result.stderr
 
+    @pytest.mark.parametrize("name", ['ws"quote', "ws|pipe", "ws&and", "ws space"])
     def test_workspace_paths_with_special_characters_still_generate_valid_json(
-        self, tmp_path
+        self, tmp_path, name
     ):
         """Workspace paths must be serialized safely into config.json."""
-        for name in ('ws"quote', "ws|pipe", "ws&and", "ws space"):
-            workspace = tmp_path / name
-            workspace.mkdir()
-            ensure_state_dir(workspace)
-            (workspace / ".git").mkdir()
-            dry_run = run_dry_run(workspace)
-            mount = _find_mount(dry_run.config_json["mounts"], "/workspace")
-            assert mount["source"] == str(workspace.resolve())
+        workspace = tmp_path / name
+        workspace.mkdir()
+        ensure_state_dir(workspace)
+        (workspace / ".git").mkdir()
+        dry_run = run_dry_run(workspace)
+        mount = _find_mount(dry_run.config_json["mounts"], "/workspace")
+        assert mount["source"] == str(workspace.resolve())
 
     def test_missing_state_dir_fails(self, tmp_path):
         """S10a/S22: the launcher should reject workspaces without .7aigent/state."""
@@ -415,13 +457,7 @@ class TestLauncherHardening:
         workspace.mkdir()
         (workspace / ".git").mkdir()
 
-        result = subprocess.run(
-            [str(get_launcher()), str(workspace)],
-            capture_output=True,
-            text=True,
-            env={**os.environ, "SANDBOX_DRY_RUN": "1"},
-        )
-        assert result.returncode != 0
+        result = run_failing_dry_run(workspace)
         assert ".7aigent/state" in result.stderr
 
     def test_symlinked_state_dir_fails(self, tmp_path):
@@ -434,13 +470,7 @@ class TestLauncherHardening:
         external_state.mkdir()
         (workspace / ".7aigent" / "state").symlink_to(external_state, target_is_directory=True)
 
-        result = subprocess.run(
-            [str(get_launcher()), str(workspace)],
-            capture_output=True,
-            text=True,
-            env={**os.environ, "SANDBOX_DRY_RUN": "1"},
-        )
-        assert result.returncode != 0
+        result = run_failing_dry_run(workspace)
         assert ".7aigent/state" in result.stderr
 
     def test_malformed_gitfile_fails(self, tmp_path):
@@ -450,23 +480,11 @@ class TestLauncherHardening:
         ensure_state_dir(workspace)
         (workspace / ".git").write_text("not-a-gitdir\n")
 
-        result = subprocess.run(
-            [str(get_launcher()), str(workspace)],
-            capture_output=True,
-            text=True,
-            env={**os.environ, "SANDBOX_DRY_RUN": "1"},
-        )
-        assert result.returncode != 0
+        result = run_failing_dry_run(workspace)
         assert "gitdir" in result.stderr
 
     def test_invalid_runner_fails(self, workspace):
-        result = subprocess.run(
-            [str(get_launcher()), str(workspace)],
-            capture_output=True,
-            text=True,
-            env={**os.environ, "SANDBOX_DRY_RUN": "1", "SANDBOX_RUNNER": "bogus"},
-        )
-        assert result.returncode != 0
+        result = run_failing_dry_run(workspace, SANDBOX_RUNNER="bogus")
         assert "unsupported sandbox runner" in result.stderr
 
     def test_bwrap_script_contains_expected_hardening(self):
@@ -490,63 +508,12 @@ class TestLauncherHardening:
 
     def test_bwrap_launcher_exits_on_sigint(self, workspace):
         """S16/S17: the resident launcher should stop and clean up on Ctrl+C."""
-        proc = subprocess.Popen(
-            [str(get_launcher()), str(workspace)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            env={**os.environ, "SANDBOX_RUNNER": "bwrap"},
-        )
-
-        kernel_json_path = Path(proc.stdout.readline().strip())
-        if not kernel_json_path.exists():
-            stderr = proc.stderr.read().strip()
-            pytest.skip(
-                "bwrap launcher could not start in this environment: "
-                f"{stderr or 'no kernel.json produced'}"
-            )
-
-        runtime_dir = kernel_json_path.parent.parent
-        time.sleep(1.0)
-        proc.send_signal(signal.SIGINT)
-
-        try:
-            proc.wait(timeout=10)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            proc.wait(timeout=10)
-            pytest.fail("launcher did not exit after SIGINT")
-
+        runtime_dir = run_bwrap_until_sigint(workspace)
         assert not runtime_dir.exists(), f"runtime directory leaked: {runtime_dir}"
 
     def test_bwrap_cleans_session_nogit_on_sigint(self, no_git_workspace):
         """S11a/S16/S17: a normal no-git session should clean up its nogit marker."""
-        proc = subprocess.Popen(
-            [str(get_launcher()), str(no_git_workspace)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            env={**os.environ, "SANDBOX_RUNNER": "bwrap"},
-        )
-
-        kernel_json_path = Path(proc.stdout.readline().strip())
-        if not kernel_json_path.exists():
-            stderr = proc.stderr.read().strip()
-            pytest.skip(
-                "bwrap launcher could not start in this environment: "
-                f"{stderr or 'no kernel.json produced'}"
-            )
-
-        time.sleep(1.0)
-        proc.send_signal(signal.SIGINT)
-
-        try:
-            proc.wait(timeout=10)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            proc.wait(timeout=10)
-            pytest.fail("launcher did not exit after SIGINT")
-
+        run_bwrap_until_sigint(no_git_workspace)
         assert not (no_git_workspace / ".7aigent" / "state" / "nogit").exists()
 
 